@@ -0,0 +1,352 @@
+"""
+cache_resultados
+================
+
+
+Cache persistente en disco para barridos y tablas de resultados.
+
+Cada resultado se identifica por un hash (sha256) de la función (nombre y
+código fuente), de sus parámetros, de la versión de la librería y de la
+precisión pedida. Los arrays se guardan como archivos .npy y al recuperarlos
+se abren con np.load(mmap_mode='r'), por lo que la lectura es sin copia.
+
+Contenido
+---------
+-CacheDisco
+    Cache en un directorio con tamaño máximo y desalojo LRU.
+-en_cache
+    Decorador que guarda en disco los resultados de una función.
+
+Configuración
+-------------
+-ORBITAL_CACHE=0
+    Variable de entorno que desactiva el cache (opt-out).
+-ORBITAL_CACHE_DIR
+    Directorio del cache (por defecto ~/.cache/orbital_maneuvers). Las
+    entradas se guardan en su subdirectorio entradas/, el único que se borra.
+
+Ejemplo:
+--------
+>>> @en_cache
+... def barrido(R, mu):
+...     return delta_v_hohmann(R, 1, mu), delta_v_bieliptica(R, 1, mu)
+>>> dv_h, dv_b = barrido(np.logspace(0, 2, 1000), MU)
+
+Autor: Eduardo Kunysz
+Fecha: 18/10/26
+"""
+
+import errno
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+from functools import wraps
+from orbital_func import __version__
+
+# Tamaño máximo por defecto del cache (bytes)
+TAMANO_MAX = 512 * 2 ** 20
+
+# Subdirectorio propio del cache dentro de directorio; sólo ahí se borra
+_SUBDIRECTORIO = "entradas"
+_ES_CLAVE = re.compile(r"[0-9a-f]{64}\Z")
+
+# Resultados admitidos: arrays o escalares numéricos, booleanos o de texto
+# de ancho fijo (dtype.kind), los únicos que np.load abre con mmap
+_ELEMENTOS = (np.ndarray, np.generic, bool, int, float, complex, str, bytes)
+_KINDS = "biufcSU"
+
+
+def _actualizar_hash(h, valor):
+    """Agrega al hash una representación estable de valor."""
+    if isinstance(valor, np.ndarray):
+        valor = np.ascontiguousarray(valor)
+        h.update(f"ndarray{valor.dtype.str}{valor.shape}".encode())
+        h.update(valor.tobytes())
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"{type(valor).__name__}{len(valor)}".encode())
+        for v in valor:
+            _actualizar_hash(h, v)
+    elif isinstance(valor, dict):
+        h.update(f"dict{len(valor)}".encode())
+        for k in sorted(valor):
+            _actualizar_hash(h, k)
+            _actualizar_hash(h, valor[k])
+    else:
+        h.update(f"{type(valor).__name__}:{valor!r};".encode())
+
+
+class CacheDisco:
+    """
+    Cache de resultados en disco direccionado por contenido.
+
+    Cada entrada es un subdirectorio directorio/entradas/<clave> con un
+    archivo .npy por array del resultado y un meta.json con su estructura.
+    La fecha de modificación del subdirectorio se usa como último acceso
+    para el desalojo LRU. Sólo se consideran entradas (y sólo se borran)
+    los subdirectorios de entradas/ cuyo nombre es un sha256 y que tienen
+    meta.json; el resto de directorio nunca se toca.
+
+    Los resultados se devuelven siempre como arrays de sólo lectura
+    (memmap de los archivos guardados), tanto si estaban en el cache como
+    si se acaban de calcular.
+
+    Parámetros:
+    ----------
+    directorio: str, opcional
+        Directorio del cache (por defecto ORBITAL_CACHE_DIR o
+        ~/.cache/orbital_maneuvers).
+    tamano_max: int, opcional
+        Tamaño máximo en bytes; al superarlo se borran las entradas
+        usadas hace más tiempo.
+    activo: bool, opcional
+        Si es False el cache no lee ni escribe nada. Por defecto se
+        desactiva con ORBITAL_CACHE=0.
+    """
+
+    def __init__(self, directorio=None, tamano_max=TAMANO_MAX, activo=None):
+        if directorio is None:
+            directorio = os.environ.get(
+                "ORBITAL_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache",
+                             "orbital_maneuvers"))
+        if activo is None:
+            activo = os.environ.get("ORBITAL_CACHE", "1") != "0"
+        self.directorio = directorio
+        self._raiz = os.path.join(directorio, _SUBDIRECTORIO)
+        self.tamano_max = tamano_max
+        self.activo = activo
+
+    def clave(self, funcion, args=(), kwargs=None, precision=None):
+        """
+        Calcula la clave (hash hexadecimal) de una llamada.
+
+        Incluye nombre y código fuente de la función, los parámetros, la
+        versión de la librería y la precisión.
+        """
+        h = hashlib.sha256()
+        h.update(f"{funcion.__module__}.{funcion.__qualname__}".encode())
+        try:
+            h.update(inspect.getsource(funcion).encode())
+        except (OSError, TypeError):
+            pass
+        h.update(f"version={__version__};numpy={np.__version__};".encode())
+        h.update(f"precision={np.dtype(precision).str if precision else None};"
+                 .encode())
+        _actualizar_hash(h, tuple(args))
+        _actualizar_hash(h, dict(kwargs or {}))
+        return h.hexdigest()
+
+    def obtener(self, clave):
+        """
+        Recupera un resultado del cache.
+
+        Retorna:
+        --------
+        (encontrado, resultado)
+            Los arrays se devuelven como memmap de sólo lectura.
+        """
+        if not self.activo or not _ES_CLAVE.match(clave):
+            return False, None
+        ruta = os.path.join(self._raiz, clave)
+        if not os.path.isdir(ruta):
+            return False, None
+        try:
+            resultado = self._leer(ruta)
+            os.utime(ruta)  # marca de último acceso para el LRU
+        except (OSError, ValueError, KeyError):
+            # Entrada dañada: se borra para poder guardarla de nuevo
+            shutil.rmtree(ruta, ignore_errors=True)
+            return False, None
+        return True, resultado
+
+    def guardar(self, clave, resultado, precision=None):
+        """
+        Guarda un resultado (array, escalar o tupla de ellos) en el cache.
+
+        Lanza TypeError si el resultado no se puede guardar como .npy
+        abrible con mmap (diccionarios, listas, dtype object, etc.).
+
+        Retorna el resultado con la precisión aplicada, leído de los
+        archivos recién guardados (memmap de sólo lectura). Si no se puede
+        escribir en el cache se devuelve el resultado en memoria, también
+        de sólo lectura.
+        """
+        tipo, arrays = self._desarmar(resultado, precision)
+        if not self.activo:
+            return self._armar(tipo, self._solo_lectura(arrays))
+        if not _ES_CLAVE.match(clave):
+            raise ValueError(f"clave inválida: '{clave}'")
+        ruta = os.path.join(self._raiz, clave)
+        tmp = None
+        try:
+            os.makedirs(self._raiz, exist_ok=True)
+            tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self._raiz)
+            for i, a in enumerate(arrays):
+                np.save(os.path.join(tmp, f"{i}.npy"), a)
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump({"tipo": tipo, "n": len(arrays)}, f)
+        except OSError:
+            # No se pudo escribir (disco lleno, permisos, ...): se devuelve
+            # el resultado en memoria sin guardarlo
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+            return self._armar(tipo, self._solo_lectura(arrays))
+        try:
+            os.replace(tmp, ruta)
+        except OSError as error:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if error.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                return self._armar(tipo, self._solo_lectura(arrays))
+            # Otra llamada ya guardó la misma clave
+        try:
+            guardado = self._leer(ruta)
+        except (OSError, ValueError, KeyError):
+            guardado = self._armar(tipo, self._solo_lectura(arrays))
+        self._desalojar()
+        return guardado
+
+    def llamar(self, funcion, *args, precision=None, **kwargs):
+        """Evalúa funcion(*args, **kwargs) usando el cache."""
+        if not self.activo:
+            return self.guardar(None, funcion(*args, **kwargs), precision)
+        clave = self.clave(funcion, args, kwargs, precision)
+        encontrado, resultado = self.obtener(clave)
+        if encontrado:
+            return resultado
+        return self.guardar(clave, funcion(*args, **kwargs), precision)
+
+    def tamano(self):
+        """Tamaño total del cache en bytes."""
+        return sum(t for _, _, t in self._entradas())
+
+    def limpiar(self):
+        """Borra todas las entradas del cache."""
+        for ruta, _, _ in self._entradas():
+            shutil.rmtree(ruta, ignore_errors=True)
+
+    def _entradas(self):
+        """Lista de (ruta, último acceso, tamaño) de cada entrada."""
+        if not os.path.isdir(self._raiz):
+            return []
+        entradas = []
+        for nombre in os.listdir(self._raiz):
+            ruta = os.path.join(self._raiz, nombre)
+            if (not _ES_CLAVE.match(nombre)
+                    or not os.path.isfile(os.path.join(ruta, "meta.json"))):
+                continue
+            try:
+                tamano = sum(e.stat().st_size for e in os.scandir(ruta))
+                entradas.append((ruta, os.stat(ruta).st_mtime, tamano))
+            except OSError:
+                continue
+        return entradas
+
+    def _desalojar(self):
+        """Borra las entradas menos usadas hasta respetar tamano_max."""
+        entradas = sorted(self._entradas(), key=lambda e: e[1])
+        total = sum(t for _, _, t in entradas)
+        for ruta, _, tamano in entradas:
+            if total <= self.tamano_max:
+                break
+            shutil.rmtree(ruta, ignore_errors=True)
+            total -= tamano
+
+    def _leer(self, ruta):
+        """Lee una entrada como memmap de sólo lectura."""
+        with open(os.path.join(ruta, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = [np.load(os.path.join(ruta, f"{i}.npy"), mmap_mode="r")
+                  for i in range(meta["n"])]
+        return self._armar(meta["tipo"], arrays)
+
+    @staticmethod
+    def _solo_lectura(arrays):
+        vistas = []
+        for a in arrays:
+            a = a.view()
+            a.flags.writeable = False
+            vistas.append(a)
+        return vistas
+
+    @staticmethod
+    def _desarmar(resultado, precision):
+        tipo = "tupla" if isinstance(resultado, tuple) else None
+        valores = resultado if tipo else (resultado,)
+        arrays = []
+        for r in valores:
+            if not isinstance(r, _ELEMENTOS):
+                raise TypeError(
+                    f"en_cache sólo admite arrays, escalares o tuplas de "
+                    f"ellos; se recibió {type(r).__name__}")
+            try:
+                a = np.asarray(r, dtype=precision)
+            except (TypeError, ValueError) as error:
+                raise TypeError(f"no se puede convertir el resultado a "
+                                f"{np.dtype(precision)}: {error}") from error
+            if a.dtype.kind not in _KINDS:
+                raise TypeError(f"en_cache no admite arrays de dtype "
+                                f"{a.dtype}")
+            arrays.append(a)
+        if tipo is None:
+            tipo = "escalar" if arrays[0].ndim == 0 else "array"
+        return tipo, arrays
+
+    @staticmethod
+    def _armar(tipo, arrays):
+        if tipo == "tupla":
+            return tuple(arrays)
+        if tipo == "escalar":
+            return arrays[0][()]
+        return arrays[0]
+
+
+def en_cache(funcion=None, *, cache=None, precision=None):
+    """
+    Decorador que guarda en disco los resultados de una función.
+
+    Parámetros:
+    ----------
+    cache: CacheDisco, opcional
+        Cache a usar (por defecto uno nuevo con la configuración del
+        entorno).
+    precision: dtype, opcional
+        Precisión con la que se guardan los arrays (p. ej. np.float32).
+        Forma parte de la clave.
+
+    Excepciones:
+    ------------
+    TypeError
+        Si la función devuelve algo que no es un array o escalar
+        numérico, booleano o de texto, o una tupla de ellos (por ejemplo
+        diccionarios, listas o arrays de dtype object).
+
+    Nota:
+    -----
+        Los arrays devueltos son siempre de sólo lectura (memmap de los
+        archivos del cache), también en la primera llamada y con el cache
+        desactivado. Para modificarlos hay que copiarlos (np.array(x)).
+
+    Ejemplo:
+    --------
+    >>> @en_cache(precision=np.float32)
+    ... def puntos(R_p, R_a):
+    ...     return orbita_eliptica_foco(R_p, R_a, 100000)
+    """
+    def decorador(f):
+        c = cache if cache is not None else CacheDisco()
+
+        @wraps(f)
+        def envoltura(*args, **kwargs):
+            return c.llamar(f, *args, precision=precision, **kwargs)
+
+        envoltura.cache = c
+        return envoltura
+
+    if funcion is not None:
+        return decorador(funcion)
+    return decorador
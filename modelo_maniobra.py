@@ -0,0 +1,263 @@
+"""
+modelo_maniobra
+===============
+
+
+Modelo de maniobra con evaluación perezosa e incremental.
+
+Cada magnitud de la maniobra (a_trans, e_trans, v_trans_a, fi_fpa, puntos de
+las órbitas, ...) es un nodo de un grafo de dependencias. Los nodos se
+calculan sólo cuando se piden y quedan guardados; al cambiar una entrada se
+invalidan únicamente los nodos que dependen de ella. Así, al mover nu en una
+transferencia no tangencial, las órbitas inicial y final no se recalculan.
+
+Contenido
+---------
+-ModeloManiobra
+    Grafo de dependencias genérico con evaluación perezosa.
+-modelo_no_tangencial
+    Construye el modelo de la transferencia no tangencial (no_tangecial.py).
+-modelo_bieliptica
+    Construye el modelo de la transferencia bieliptica (bieliptica.py).
+
+Ejemplo:
+--------
+>>> modelo = modelo_no_tangencial(7000e3, 70000e3, mu, nu=145)
+>>> modelo['delta_v_total']
+>>> modelo.actualizar(nu=150)   # sólo se invalidan los nodos que usan nu
+>>> modelo['delta_v_total']
+
+Autor: Eduardo Kunysz
+Fecha: 18/10/26
+"""
+
+import math as op
+import numpy as np
+from orbital_func import orbita_eliptica_foco
+
+
+def _raiz(x):
+    """
+    Raíz cuadrada con math, salvo radicandos negativos.
+
+    Con x < 0 se usa numpy, que devuelve nan con un RuntimeWarning, igual
+    que delta_v_one_tangent_burn cuando nu está fuera de rango.
+    """
+    return op.sqrt(x) if x >= 0 else np.sqrt(x)
+
+
+class ModeloManiobra:
+    """
+    Grafo de dependencias con evaluación perezosa.
+
+    Las entradas se fijan en el constructor o con actualizar(). Los nodos
+    derivados se registran con nodo() indicando la función y los nombres de
+    los nodos de los que depende; la función recibe sus valores en ese orden.
+    """
+
+    def __init__(self, **entradas):
+        self._funciones = {}     # nombre -> (funcion, dependencias)
+        self._dependientes = {}  # nombre -> nodos que lo usan directamente
+        self._valores = {}       # cache de valores calculados
+        self._entradas = set()
+        for nombre, valor in entradas.items():
+            self._entradas.add(nombre)
+            self._dependientes.setdefault(nombre, [])
+            self._valores[nombre] = valor
+
+    def nodo(self, nombre, funcion, dependencias):
+        """
+        Registra un nodo derivado.
+
+        Parámetros:
+        ----------
+        nombre: str
+            Nombre del nodo.
+        funcion: callable
+            Función que calcula el nodo a partir de sus dependencias.
+        dependencias: list of str
+            Nombres de los nodos (entradas u otros derivados) que usa.
+        """
+        self._funciones[nombre] = (funcion, tuple(dependencias))
+        self._dependientes.setdefault(nombre, [])
+        for dep in dependencias:
+            self._dependientes.setdefault(dep, []).append(nombre)
+        self._invalidar(nombre)
+        return self
+
+    def __getitem__(self, nombre):
+        if nombre in self._valores:
+            return self._valores[nombre]
+        if nombre not in self._funciones:
+            raise KeyError(nombre)
+        funcion, dependencias = self._funciones[nombre]
+        valor = funcion(*(self[dep] for dep in dependencias))
+        self._valores[nombre] = valor
+        return valor
+
+    def __contains__(self, nombre):
+        return nombre in self._entradas or nombre in self._funciones
+
+    def actualizar(self, **cambios):
+        """
+        Cambia entradas e invalida sólo los nodos que dependen de ellas.
+
+        Los escalares iguales a los actuales no invalidan nada. Los arrays
+        siempre invalidan, aunque sean el mismo objeto, porque pudieron
+        modificarse en el lugar.
+        """
+        for nombre, valor in cambios.items():
+            if nombre not in self._entradas:
+                raise KeyError(f"'{nombre}' no es una entrada del modelo")
+            actual = self._valores[nombre]
+            if (np.isscalar(actual) and np.isscalar(valor)
+                    and actual == valor):
+                continue
+            for dependiente in self._dependientes[nombre]:
+                self._invalidar(dependiente)
+            self._valores[nombre] = valor
+
+    def calculados(self):
+        """Nombres de los nodos derivados que están en cache."""
+        return [n for n in self._funciones if n in self._valores]
+
+    def _invalidar(self, nombre):
+        # Si el nodo no estaba calculado, sus dependientes tampoco pueden
+        # estarlo, así que se corta la propagación.
+        if nombre not in self._valores:
+            return
+        del self._valores[nombre]
+        for dependiente in self._dependientes[nombre]:
+            self._invalidar(dependiente)
+
+
+def modelo_no_tangencial(R_i, R_f, mu, nu, num_puntos=1000):
+    """
+    Construye el modelo de una transferencia no tangencial.
+
+    Parámetros:
+    ----------
+    R_i: float
+        Radio de la órbita inicial.
+    R_f: float
+        Radio de la órbita final.
+    mu: float
+        Parámetro gravitacional.
+    nu: float
+        Anomalía verdadera en el arribo (grados).
+    num_puntos: int, opcional
+        Puntos de cada órbita (por defecto 1000).
+
+    Retorna:
+    --------
+    ModeloManiobra
+        Nodos: Q, nu_inf, nu_sup, e_trans, a_trans, r_a, v_i, v_f,
+        v_trans_a, v_trans_b, delta_va, fi_fpa, delta_vb, delta_v_total,
+        orbita_inicial, orbita_final, orbita_trans.
+
+    Nota:
+    -----
+        Con nu fuera de [nu_inf, nu_sup] los nodos que dependen de nu valen
+        nan, igual que delta_v_one_tangent_burn.
+    """
+    m = ModeloManiobra(R_i=R_i, R_f=R_f, mu=mu, nu=nu, num_puntos=num_puntos)
+
+    # Relacion inversa de r_final /r_inicial y limites de nu
+    m.nodo('Q', lambda R_i, R_f: R_i / R_f, ['R_i', 'R_f'])
+    m.nodo('nu_inf', lambda Q: op.degrees(op.acos(2 * Q - 1)), ['Q'])
+    m.nodo('nu_sup', lambda Q: op.degrees(op.acos(
+        (Q * (1 + (Q - 1) / (-1 - Q)) - 1) / ((Q - 1) / (-1 - Q)))), ['Q'])
+
+    # Geometria de la orbita de transferencia
+    m.nodo('e_trans', lambda Q, nu: (Q - 1) / (op.cos(op.radians(nu)) - Q),
+           ['Q', 'nu'])
+    m.nodo('a_trans', lambda R_i, e: R_i / (1 - e), ['R_i', 'e_trans'])
+    m.nodo('r_a', lambda a, e: (a * (1 - e ** 2)) / (1 - e),
+           ['a_trans', 'e_trans'])
+
+    # Velocidades
+    m.nodo('v_i', lambda mu, R_i: op.sqrt(mu / R_i), ['mu', 'R_i'])
+    m.nodo('v_f', lambda mu, R_f: op.sqrt(mu / R_f), ['mu', 'R_f'])
+    m.nodo('v_trans_a', lambda mu, R_i, a: _raiz(mu * (2 / R_i - 1 / a)),
+           ['mu', 'R_i', 'a_trans'])
+    m.nodo('v_trans_b', lambda mu, R_f, a: _raiz(mu * (2 / R_f - 1 / a)),
+           ['mu', 'R_f', 'a_trans'])
+
+    # Flight Path Angle y delta-v
+    m.nodo('fi_fpa', lambda e, nu: op.degrees(op.atan(
+        e * op.sin(op.radians(nu)) / (1 + e * op.cos(op.radians(nu))))),
+        ['e_trans', 'nu'])
+    m.nodo('delta_va', lambda va, vi: va - vi, ['v_trans_a', 'v_i'])
+    m.nodo('delta_vb', lambda vf, vb, fi: _raiz(
+        vf ** 2 + vb ** 2 - 2 * vf * vb * op.cos(op.radians(fi))),
+        ['v_f', 'v_trans_b', 'fi_fpa'])
+    m.nodo('delta_v_total', lambda dva, dvb: abs(dva) + abs(dvb),
+           ['delta_va', 'delta_vb'])
+
+    # Puntos de las orbitas
+    m.nodo('orbita_inicial', lambda R_i, n: orbita_eliptica_foco(R_i, R_i, n),
+           ['R_i', 'num_puntos'])
+    m.nodo('orbita_final', lambda R_f, n: orbita_eliptica_foco(R_f, R_f, n),
+           ['R_f', 'num_puntos'])
+    m.nodo('orbita_trans', lambda R_i, r_a, n: orbita_eliptica_foco(R_i, r_a, n),
+           ['R_i', 'r_a', 'num_puntos'])
+    return m
+
+
+def modelo_bieliptica(R_i, R_f, r_intermedia, mu, num_puntos=1000):
+    """
+    Construye el modelo de una transferencia bieliptica.
+
+    Parámetros:
+    ----------
+    R_i: float
+        Radio de la órbita inicial.
+    R_f: float
+        Radio de la órbita final.
+    r_intermedia: float
+        Radio del apoapsis intermedio.
+    mu: float
+        Parámetro gravitacional.
+    num_puntos: int, opcional
+        Puntos de cada órbita (por defecto 1000).
+
+    Retorna:
+    --------
+    ModeloManiobra
+        Nodos: at1, at2, v1, v2, va, v1b, v2b, vc, delta_v1, delta_v2,
+        delta_v3, delta_v_total, orbita_inicial, orbita_t1, orbita_t2,
+        orbita_final.
+    """
+    m = ModeloManiobra(R_i=R_i, R_f=R_f, r_intermedia=r_intermedia, mu=mu,
+                       num_puntos=num_puntos)
+
+    # Semiejes mayores de las transferencias
+    m.nodo('at1', lambda R_i, r_b: (R_i + r_b) / 2, ['R_i', 'r_intermedia'])
+    m.nodo('at2', lambda r_b, R_f: (r_b + R_f) / 2, ['r_intermedia', 'R_f'])
+
+    # Velocidades en cada fase de la transferencia
+    vis_viva = lambda mu, r, a: op.sqrt(mu * (2 / r - 1 / a))
+    m.nodo('v1', lambda mu, R_i: op.sqrt(mu / R_i), ['mu', 'R_i'])
+    m.nodo('v2', lambda mu, R_f: op.sqrt(mu / R_f), ['mu', 'R_f'])
+    m.nodo('va', vis_viva, ['mu', 'R_i', 'at1'])
+    m.nodo('v1b', vis_viva, ['mu', 'r_intermedia', 'at1'])
+    m.nodo('v2b', vis_viva, ['mu', 'r_intermedia', 'at2'])
+    m.nodo('vc', vis_viva, ['mu', 'R_f', 'at2'])
+
+    # Cambios de velocidad
+    m.nodo('delta_v1', lambda va, v1: va - v1, ['va', 'v1'])
+    m.nodo('delta_v2', lambda v2b, v1b: v2b - v1b, ['v2b', 'v1b'])
+    m.nodo('delta_v3', lambda v2, vc: v2 - vc, ['v2', 'vc'])
+    m.nodo('delta_v_total', lambda d1, d2, d3: abs(d1) + abs(d2) + abs(d3),
+           ['delta_v1', 'delta_v2', 'delta_v3'])
+
+    # Puntos de las orbitas
+    m.nodo('orbita_inicial', lambda R_i, n: orbita_eliptica_foco(R_i, R_i, n),
+           ['R_i', 'num_puntos'])
+    m.nodo('orbita_t1', lambda R_i, r_b, n: orbita_eliptica_foco(R_i, r_b, n),
+           ['R_i', 'r_intermedia', 'num_puntos'])
+    m.nodo('orbita_t2', lambda R_f, r_b, n: orbita_eliptica_foco(R_f, r_b, n),
+           ['R_f', 'r_intermedia', 'num_puntos'])
+    m.nodo('orbita_final', lambda R_f, n: orbita_eliptica_foco(R_f, R_f, n),
+           ['R_f', 'num_puntos'])
+    return m
@@ -18,21 +18,67 @@ Funciones incluidas
     Calcula los delta-v totales de una transferencia de hohmann
 -delta_v_bieliptica
     Calcula los delta-v totales de una trnasferencia bieliptica
+-delta_v_one_tangent_burn
+    Calcula el delta-v total para una maniobra no tangencial.
+-delta_v_hohmann_grad
+    Delta-v de Hohmann y sus derivadas parciales exactas.
+-delta_v_bieliptica_grad
+    Delta-v bieliptico y sus derivadas parciales exactas.
+-delta_v_one_tangent_burn_grad
+    Delta-v no tangencial y sus derivadas parciales exactas.
+-plan_fase_constelacion
+    Planifica en lote las maniobras de fase de una constelación.
+-estado_a_elementos
+    Convierte vectores de estado (N, 6) en elementos orbitales clásicos.
+-elementos_a_estado
+    Convierte elementos orbitales clásicos (N, 6) en vectores de estado.
 
 Changelog: 
 ---------
 |Fecha      | Autor |   Descripción
 +-----------+-------+---------------------------------------------------------
+|18/10/26   |   EK  |   Se agregan estado_a_elementos y elementos_a_estado
+|18/10/26   |   EK  |   Se agrega la función plan_fase_constelacion
+|18/10/26   |   EK  |   Camino rapido con math para escalares y soporte de
+|           |       |   arrays en delta_v_one_tangent_burn
+|18/10/26   |   EK  |   Se agregan las funciones *_grad con derivadas analíticas
+|           |       |   y r_intermedia opcional en delta_v_bieliptica
 |14/10/24   |   EK  |   Se agrega la función delta_v_bieliptica
 |17/09/24   |   EK  |   Versión inicial de la librería
 
 Autor: Eduardo Kunysz
 
-Fecha: 14/10/24
+Fecha: 18/10/26
 """
 
 import numpy as np
 import math as op
+from types import SimpleNamespace
+
+__version__ = "1.1.0"
+
+# Funciones de numpy con los mismos nombres que las del modulo math, para
+# poder escribir cada calculo una sola vez (ver _mat).
+_NP = SimpleNamespace(sqrt=np.sqrt, sin=np.sin, cos=np.cos, atan=np.arctan,
+                      radians=np.radians, degrees=np.degrees)
+
+
+def _mat(valor):
+    """
+    Elige el modulo de funciones matematicas segun el tipo de valor.
+
+    valor es un resultado intermedio que combina todas las entradas: es un
+    float de Python sólo si todas ellas son escalares de Python. En ese caso
+    se usa math, que evita el costo de numpy en llamadas sueltas; si no
+    (arrays o escalares de numpy) se usa numpy.
+
+    math.sqrt lanza ValueError con radicandos negativos, mientras que numpy
+    devuelve nan con un RuntimeWarning. Las funciones que usan _mat capturan
+    ese ValueError y repiten el calculo con np.float64, de modo que ambos
+    caminos dan nan.
+    """
+    return op if type(valor) is float else _NP
+
 
 def orbita_eliptica_foco(R_p, R_a, num_puntos=1000):
     """
@@ -92,7 +138,7 @@ def velocidad_orbital(r, G, a, M_tierra):
 
     Parámetros:
     ----------
-    r : float
+    r : float o numpy.ndarray
         La distancia radial desde el centro de la Tierra al punto en la órbita 
         (en metros).
     G: float
@@ -104,13 +150,16 @@ def velocidad_orbital(r, G, a, M_tierra):
 
     Retorna:
     -------
-    float
+    float o numpy.ndarray
         La velocidad orbital en ese punto (en metros por segundo).
 
     Fórmula utilizada:
     v = sqrt(G * M_tierra * (2 / r - 1 / a))
     """
-    return np.sqrt(G * M_tierra * (2 / r - 1 / a))
+    v2 = G * M_tierra * (2 / r - 1 / a)
+    if type(v2) is float and v2 >= 0:
+        return op.sqrt(v2)
+    return np.sqrt(v2)
 
 
 def energia_cinetica(v, m_nave):
@@ -152,14 +201,21 @@ def delta_v_hohmann(r_final: float, r_inicial: float, mu: float):
         Delta-v total en km/s.
     """
     a = (r_inicial + r_final) / 2
-    v1 = np.sqrt(mu / r_inicial)
-    v2 = np.sqrt(mu / r_final)
-    va = np.sqrt(mu * (2 / r_inicial - 1 / a))
-    vb = np.sqrt(mu * (2 / r_final - 1 / a))
+    m = _mat(mu / a)
+    try:
+        v1 = m.sqrt(mu / r_inicial)
+        v2 = m.sqrt(mu / r_final)
+        va = m.sqrt(mu * (2 / r_inicial - 1 / a))
+        vb = m.sqrt(mu * (2 / r_final - 1 / a))
+    except ValueError:
+        # Raiz de un negativo en math: se repite con numpy (nan)
+        return delta_v_hohmann(np.float64(r_final), np.float64(r_inicial),
+                               np.float64(mu))
     delta_v = abs(va - v1) + abs(v2 - vb)
     return delta_v
 
-def delta_v_bieliptica(r_final: float, r_inicial: float, mu: float):
+def delta_v_bieliptica(r_final: float, r_inicial: float, mu: float,
+                       r_intermedia: float = None):
     """
     Calcula el delta-v total para una transferencia bieliptica.
 
@@ -171,6 +227,8 @@ def delta_v_bieliptica(r_final: float, r_inicial: float, mu: float):
         Radio de la órbita inicial.
     mu: float
         Parámetro gravitacional (km^3/s^2)
+    r_intermedia: float, opcional
+        Radio del apoapsis intermedio. Por defecto r_final * 1000.
 
     Retorna:
     --------
@@ -178,23 +236,30 @@ def delta_v_bieliptica(r_final: float, r_inicial: float, mu: float):
 
     Nota:
     -----
-        El valor de la r para la orbita intermedia se calcula de forma fija
-        por ahora un valor grande
+        Si no se indica r_intermedia se usa un valor grande fijo
+        (r_final * 1000)
     """
     # Valor de r_intermedio tendiendo a infinito (caso teorico optimo)
-    r_intermedia = r_final * 1000 
+    if r_intermedia is None:
+        r_intermedia = r_final * 1000
     
     # Calculo de semiejes mayores de las transferencias
     at1 = (r_inicial + r_intermedia) / 2
     at2 = (r_intermedia + r_final) / 2
+    m = _mat(mu / at1 + at2)
     
     # Velocidades en cda fse de la transferencia bieliptica
-    v1  = np.sqrt(mu / r_inicial)
-    v2  = np.sqrt(mu / r_final)
-    va  = np.sqrt(mu * (2 / r_inicial - 1 / at1))
-    v1b = np.sqrt(mu * (2 / r_intermedia - 1 / at1))
-    v2b = np.sqrt(mu * (2 / r_intermedia - 1 / at2))
-    vc  = np.sqrt(mu * (2 / r_final - 1 / at2))
+    try:
+        v1  = m.sqrt(mu / r_inicial)
+        v2  = m.sqrt(mu / r_final)
+        va  = m.sqrt(mu * (2 / r_inicial - 1 / at1))
+        v1b = m.sqrt(mu * (2 / r_intermedia - 1 / at1))
+        v2b = m.sqrt(mu * (2 / r_intermedia - 1 / at2))
+        vc  = m.sqrt(mu * (2 / r_final - 1 / at2))
+    except ValueError:
+        # Raiz de un negativo en math: se repite con numpy (nan)
+        return delta_v_bieliptica(np.float64(r_final), np.float64(r_inicial),
+                                  np.float64(mu), np.float64(r_intermedia))
     
     # Calcular los cambios de velocidad
     delta_v1 = abs(va - v1)           # Cambio en r_inicial
@@ -224,37 +289,510 @@ def delta_v_one_tangent_burn(r_final: float, r_inicial: float, mu: float, nu: fl
     --------
         Delta-v total en km/s.
 
+    Nota:
+    -----
+        Acepta escalares o arrays de numpy (con broadcasting). Con escalares
+        de Python se usa math y con arrays numpy; los resultados coinciden
+        salvo 1 ulp por las funciones trigonometricas de cada libreria.
+        Con nu fuera de rango ambos caminos devuelven nan.
     """
 
     #Relacion inversa de r_final /r_inicial (uso Q en lugar de R^-1)
     Q = r_inicial / r_final    
+    m = _mat(mu * Q + nu)
   
     # Calculo de excentricidad
 
-    e_trans = (Q - 1) / (op.cos(op.radians(nu)) - Q)
+    e_trans = (Q - 1) / (m.cos(m.radians(nu)) - Q)
     # Calculo de semiejes mayores de las transferencias
     a_trans = r_inicial / (1 - e_trans)
   
-    # Velocidades en cada fase circular 
-    v_i = op.sqrt(mu / r_inicial)
-    v_f = op.sqrt(mu / r_final)
-
-    # Velocidad en cada etapa de transferencia
-    v_trans_a  = op.sqrt(mu * (2 / r_inicial - 1 / a_trans))
-    v_trans_b  = op.sqrt(mu * (2 / r_final - 1 / a_trans))
-    
-    # Calcular de Delta-Va
-    delta_va = v_trans_a - v_i        # Cambio en r_inicial
-    
-    # Calculo de Fligth Path Angle
-    tan_fi = e_trans * op.sin(op.radians(nu)) / (1 + e_trans * op.cos(op.radians(nu)))
-    fi_fpa = op.degrees(op.atan(tan_fi))
-    
-    # Calculo de Delta-Vb
-    delta_vb = op.sqrt(v_f ** + v_trans_b ** - 2 * v_f * v_trans_b * 
-                       op.cos(op.radians(fi_fpa)))
+    try:
+        # Velocidades en cada fase circular 
+        v_i = m.sqrt(mu / r_inicial)
+        v_f = m.sqrt(mu / r_final)
+
+        # Velocidad en cada etapa de transferencia
+        v_trans_a  = m.sqrt(mu * (2 / r_inicial - 1 / a_trans))
+        v_trans_b  = m.sqrt(mu * (2 / r_final - 1 / a_trans))
+        
+        # Calcular de Delta-Va
+        delta_va = v_trans_a - v_i        # Cambio en r_inicial
+        
+        # Calculo de Fligth Path Angle
+        tan_fi = e_trans * m.sin(m.radians(nu)) / (1 + e_trans * m.cos(m.radians(nu)))
+        fi_fpa = m.degrees(m.atan(tan_fi))
+        
+        # Calculo de Delta-Vb
+        delta_vb = m.sqrt(v_f ** 2 + v_trans_b ** 2 - 2 * v_f * v_trans_b * 
+                           m.cos(m.radians(fi_fpa)))
+    except ValueError:
+        # Raiz de un negativo en math (nu fuera de rango): se repite con
+        # numpy, que devuelve nan
+        return delta_v_one_tangent_burn(np.float64(r_final),
+                                        np.float64(r_inicial),
+                                        np.float64(mu), np.float64(nu))
 
     # Suma de todos los delta-v
     delta_v_total = abs(delta_va) + abs(delta_vb)
     return delta_v_total
 
+
+
+def _vis_viva_grad(mu, r, a):
+    """
+    Velocidad por vis-viva y sus derivadas parciales respecto de r y a.
+
+    Retorna:
+    --------
+        (v, dv/dr, dv/da)
+    """
+    v = np.sqrt(mu * (2 / r - 1 / a))
+    return v, -mu / (v * r ** 2), mu / (2 * v * a ** 2)
+
+
+def delta_v_hohmann_grad(r_final, r_inicial, mu: float):
+    """
+    Calcula el delta-v de Hohmann junto con sus derivadas parciales exactas.
+
+    Acepta escalares o arrays (se aplica broadcasting de numpy), de modo que
+    un lote de maniobras se evalúa en una sola llamada.
+
+    Parámetros:
+    ----------
+    r_final: float o numpy.ndarray
+        Radio de la órbita final.
+    r_inicial: float o numpy.ndarray
+        Radio de la órbita inicial.
+    mu: float
+        Parámetro gravitacional (km^3/s^2)
+
+    Retorna:
+    --------
+    delta_v : numpy.ndarray
+        Delta-v total (igual a delta_v_hohmann).
+    d_r_final : numpy.ndarray
+        Derivada parcial del delta-v respecto de r_final.
+    d_r_inicial : numpy.ndarray
+        Derivada parcial del delta-v respecto de r_inicial.
+
+    Nota:
+    -----
+        Donde un impulso es nulo (r_final == r_inicial) se usa la
+        subderivada 0 de abs().
+    """
+    r_final = np.asarray(r_final, dtype=float)
+    r_inicial = np.asarray(r_inicial, dtype=float)
+
+    a = (r_inicial + r_final) / 2
+    v1 = np.sqrt(mu / r_inicial)
+    v2 = np.sqrt(mu / r_final)
+    va, va_r, va_a = _vis_viva_grad(mu, r_inicial, a)
+    vb, vb_r, vb_a = _vis_viva_grad(mu, r_final, a)
+
+    s1 = np.sign(va - v1)
+    s2 = np.sign(v2 - vb)
+    delta_v = np.abs(va - v1) + np.abs(v2 - vb)
+
+    # da/dr_inicial = da/dr_final = 1/2
+    d_r_inicial = (s1 * (va_r + va_a / 2 + v1 / (2 * r_inicial))
+                   - s2 * vb_a / 2)
+    d_r_final = (s1 * va_a / 2
+                 + s2 * (-v2 / (2 * r_final) - vb_r - vb_a / 2))
+    return delta_v, d_r_final, d_r_inicial
+
+
+def delta_v_bieliptica_grad(r_final, r_inicial, mu: float, r_intermedia=None):
+    """
+    Calcula el delta-v bieliptico junto con sus derivadas parciales exactas.
+
+    Acepta escalares o arrays (se aplica broadcasting de numpy).
+
+    Parámetros:
+    ----------
+    r_final: float o numpy.ndarray
+        Radio de la órbita final.
+    r_inicial: float o numpy.ndarray
+        Radio de la órbita inicial.
+    mu: float
+        Parámetro gravitacional (km^3/s^2)
+    r_intermedia: float o numpy.ndarray, opcional
+        Radio del apoapsis intermedio. Por defecto r_final * 1000, igual que
+        en delta_v_bieliptica.
+
+    Retorna:
+    --------
+    delta_v : numpy.ndarray
+        Delta-v total (igual a delta_v_bieliptica).
+    d_r_final : numpy.ndarray
+        Derivada respecto de r_final.
+    d_r_inicial : numpy.ndarray
+        Derivada respecto de r_inicial.
+    d_r_intermedia : numpy.ndarray
+        Derivada respecto de r_intermedia.
+
+    Nota:
+    -----
+        Si r_intermedia no se indica, d_r_final es la derivada total e
+        incluye la dependencia r_intermedia = r_final * 1000.
+    """
+    r_final = np.asarray(r_final, dtype=float)
+    r_inicial = np.asarray(r_inicial, dtype=float)
+    r_int_fijo = r_intermedia is None
+    if r_int_fijo:
+        r_intermedia = r_final * 1000
+    r_intermedia = np.asarray(r_intermedia, dtype=float)
+
+    at1 = (r_inicial + r_intermedia) / 2
+    at2 = (r_intermedia + r_final) / 2
+
+    v1 = np.sqrt(mu / r_inicial)
+    v2 = np.sqrt(mu / r_final)
+    va, va_r, va_a = _vis_viva_grad(mu, r_inicial, at1)
+    v1b, v1b_r, v1b_a = _vis_viva_grad(mu, r_intermedia, at1)
+    v2b, v2b_r, v2b_a = _vis_viva_grad(mu, r_intermedia, at2)
+    vc, vc_r, vc_a = _vis_viva_grad(mu, r_final, at2)
+
+    s1 = np.sign(va - v1)
+    s2 = np.sign(v2b - v1b)
+    s3 = np.sign(v2 - vc)
+    delta_v = np.abs(va - v1) + np.abs(v2b - v1b) + np.abs(v2 - vc)
+
+    # Cada semieje depende con peso 1/2 de sus dos radios
+    d_r_inicial = (s1 * (va_r + va_a / 2 + v1 / (2 * r_inicial))
+                   - s2 * v1b_a / 2)
+    d_r_intermedia = (s1 * va_a / 2
+                      + s2 * (v2b_r + v2b_a / 2 - v1b_r - v1b_a / 2)
+                      - s3 * vc_a / 2)
+    d_r_final = (s2 * v2b_a / 2
+                 + s3 * (-v2 / (2 * r_final) - vc_r - vc_a / 2))
+
+    if r_int_fijo:
+        d_r_final = d_r_final + 1000 * d_r_intermedia
+    return delta_v, d_r_final, d_r_inicial, d_r_intermedia
+
+
+def delta_v_one_tangent_burn_grad(r_final, r_inicial, mu: float, nu):
+    """
+    Calcula el delta-v no tangencial junto con sus derivadas parciales exactas.
+
+    Acepta escalares o arrays (se aplica broadcasting de numpy).
+
+    Parámetros:
+    ----------
+    r_final: float o numpy.ndarray
+        Radio de la órbita final.
+    r_inicial: float o numpy.ndarray
+        Radio de la órbita inicial.
+    mu: float
+        Parámetro gravitacional (km^3/s^2)
+    nu: float o numpy.ndarray
+        Anomalía verdadera (grados)
+
+    Retorna:
+    --------
+    delta_v : numpy.ndarray
+        Delta-v total (igual a delta_v_one_tangent_burn).
+    d_r_final : numpy.ndarray
+        Derivada respecto de r_final.
+    d_r_inicial : numpy.ndarray
+        Derivada respecto de r_inicial.
+    d_nu : numpy.ndarray
+        Derivada respecto de nu (por grado).
+    """
+    r_final = np.asarray(r_final, dtype=float)
+    r_inicial = np.asarray(r_inicial, dtype=float)
+    nu_rad = np.radians(nu)
+    k = np.pi / 180  # d(nu_rad)/d(nu)
+    c = np.cos(nu_rad)
+    s = np.sin(nu_rad)
+
+    # Relacion inversa y excentricidad
+    Q = r_inicial / r_final
+    e_trans = (Q - 1) / (c - Q)
+    de_dQ = (c - 1) / (c - Q) ** 2
+    de_dri = de_dQ / r_final
+    de_drf = -de_dQ * Q / r_final
+    de_dnu = e_trans / (c - Q) * s * k
+
+    # Semieje mayor de la transferencia
+    a_trans = r_inicial / (1 - e_trans)
+    da_de = r_inicial / (1 - e_trans) ** 2
+    da_dri = 1 / (1 - e_trans) + da_de * de_dri
+    da_drf = da_de * de_drf
+    da_dnu = da_de * de_dnu
+
+    # Velocidades circulares y de transferencia
+    v_i = np.sqrt(mu / r_inicial)
+    v_f = np.sqrt(mu / r_final)
+    vta, vta_r, vta_a = _vis_viva_grad(mu, r_inicial, a_trans)
+    vtb, vtb_r, vtb_a = _vis_viva_grad(mu, r_final, a_trans)
+
+    # Delta-Va y sus derivadas
+    delta_va = vta - v_i
+    dva_dri = vta_r + vta_a * da_dri + v_i / (2 * r_inicial)
+    dva_drf = vta_a * da_drf
+    dva_dnu = vta_a * da_dnu
+
+    # Flight Path Angle (radianes): fi = atan(u)
+    den = 1 + e_trans * c
+    u = e_trans * s / den
+    du_de = s / den ** 2
+    fi = np.arctan(u)
+    dfi_dri = du_de * de_dri / (1 + u ** 2)
+    dfi_drf = du_de * de_drf / (1 + u ** 2)
+    dfi_dnu = (du_de * de_dnu
+               + k * e_trans * (c + e_trans) / den ** 2) / (1 + u ** 2)
+
+    # Delta-Vb por ley de cosenos y sus derivadas
+    cos_fi = np.cos(fi)
+    sin_fi = np.sin(fi)
+    delta_vb = np.sqrt(v_f ** 2 + vtb ** 2 - 2 * v_f * vtb * cos_fi)
+    dvf_drf = -v_f / (2 * r_final)
+    dvtb_dri = vtb_a * da_dri
+    dvtb_drf = vtb_r + vtb_a * da_drf
+    dvtb_dnu = vtb_a * da_dnu
+
+    def _d_delta_vb(dvf, dvtb, dfi):
+        return (v_f * dvf + vtb * dvtb - (dvf * vtb + v_f * dvtb) * cos_fi
+                + v_f * vtb * sin_fi * dfi) / delta_vb
+
+    dvb_dri = _d_delta_vb(0, dvtb_dri, dfi_dri)
+    dvb_drf = _d_delta_vb(dvf_drf, dvtb_drf, dfi_drf)
+    dvb_dnu = _d_delta_vb(0, dvtb_dnu, dfi_dnu)
+
+    sa = np.sign(delta_va)
+    delta_v = np.abs(delta_va) + delta_vb
+    d_r_final = sa * dva_drf + dvb_drf
+    d_r_inicial = sa * dva_dri + dvb_dri
+    d_nu = sa * dva_dnu + dvb_dnu
+    return delta_v, d_r_final, d_r_inicial, d_nu
+
+
+def plan_fase_constelacion(r: float, mu: float, n_satelites: int,
+                           t_max: float, k_max: int = 50,
+                           r_min: float = 0.0):
+    """
+    Planifica las maniobras de fase para desplegar una constelación.
+
+    Los n_satelites parten del mismo punto de una órbita circular de radio r
+    y cada uno debe llegar a su lugar, desfasado 360 * j / n_satelites grados
+    hacia adelante. Para cada lugar se prueba una órbita de fase interior
+    (más rápida, adelanta el desfase) o exterior (más lenta, atrasa
+    360 - desfase) durante k = 1..k_max revoluciones, con un impulso de
+    entrada y otro igual de salida en r. Se elige la opción de menor delta-v
+    que termina antes de t_max. Todos los lugares se resuelven en una sola
+    pasada vectorizada.
+
+    Parámetros:
+    ----------
+    r: float
+        Radio de la órbita circular de la constelación.
+    mu: float
+        Parámetro gravitacional.
+    n_satelites: int
+        Cantidad de satélites (lugares equiespaciados).
+    t_max: float
+        Tiempo máximo de la maniobra de fase (s).
+    k_max: int, opcional
+        Máximo número de revoluciones en la órbita de fase (por defecto 50).
+    r_min: float, opcional
+        Radio mínimo admisible del periapsis de la órbita de fase (por
+        ejemplo el radio terrestre más un margen).
+
+    Excepciones:
+    ------------
+    ValueError
+        Si n_satelites o k_max son menores que 1.
+
+    Retorna:
+    --------
+    k_rev : numpy.ndarray
+        Revoluciones en la órbita de fase de cada satélite.
+    a_fase : numpy.ndarray
+        Semieje mayor de la órbita de fase (a_fase < r si adelanta).
+    delta_v : numpy.ndarray
+        Delta-v total (entrada + salida) de cada satélite.
+    tiempo : numpy.ndarray
+        Duración de la maniobra de cada satélite.
+
+    Nota:
+    -----
+        El satélite 0 ya está en su lugar (k_rev = 0, delta_v = 0). Si un
+        lugar no tiene solución dentro de t_max se devuelve k_rev = 0,
+        delta_v = inf y a_fase, tiempo = nan.
+
+    Ejemplo:
+    --------
+    >>> k, a, dv, t = plan_fase_constelacion(7000e3, mu, 24, 2 * 86400)
+    """
+    if n_satelites < 1:
+        raise ValueError(f"n_satelites debe ser al menos 1 (se recibió "
+                         f"{n_satelites})")
+    if k_max < 1:
+        raise ValueError(f"k_max debe ser al menos 1 revolución (se recibió "
+                         f"{k_max})")
+
+    T = 2 * np.pi * np.sqrt(r ** 3 / mu)
+    v_c = np.sqrt(mu / r)
+
+    # Desfase de cada lugar como fraccion de vuelta, columnas: revoluciones
+    fraccion = (np.arange(n_satelites) / n_satelites)[:, None]
+    k = np.arange(1, k_max + 1)[None, :]
+
+    # Periodos de fase: interior (adelanta) y exterior (atrasa)
+    T_fase = np.stack([T * (1 - fraccion / k),
+                       T * (1 + (1 - fraccion) / k)])
+    a = np.cbrt(mu * (T_fase / (2 * np.pi)) ** 2)
+    tiempo = k * T_fase
+
+    # Opciones dentro del tiempo y con periapsis 2a - r admisible
+    factible = (tiempo <= t_max) & (2 * a - r >= r_min)
+
+    # Delta-v de entrada y salida en r (vis-viva)
+    v_fase = np.sqrt(mu * np.where(factible, 2 / r - 1 / a, 1 / r))
+    dv = np.where(factible, 2 * np.abs(v_fase - v_c), np.inf)
+
+    # Mejor opcion por lugar entre ambos sentidos y todas las revoluciones
+    dv = dv.transpose(1, 0, 2).reshape(n_satelites, -1)
+    mejor = np.argmin(dv, axis=1)
+    filas = np.arange(n_satelites)
+    delta_v = dv[filas, mejor]
+    sentido, k_idx = np.divmod(mejor, k_max)
+    a_fase = a[sentido, filas, k_idx]
+    tiempo = tiempo[sentido, filas, k_idx]
+    k_rev = k_idx + 1
+
+    # Lugar 0 (sin desfase) y lugares sin solucion
+    sin_fase = fraccion[:, 0] == 0
+    sin_solucion = ~np.isfinite(delta_v) & ~sin_fase
+    k_rev[sin_fase | sin_solucion] = 0
+    delta_v[sin_fase] = 0.0
+    a_fase = np.where(sin_fase, r, np.where(sin_solucion, np.nan, a_fase))
+    tiempo = np.where(sin_fase, 0.0, np.where(sin_solucion, np.nan, tiempo))
+    return k_rev, a_fase, delta_v, tiempo
+
+
+def _angulo(desde, hacia, eje):
+    """
+    Ángulo (rad, en [0, 2pi)) de desde a hacia, con signo según eje.
+
+    Opera sobre arrays (..., 3) fila a fila.
+    """
+    y = np.sum(eje * np.cross(desde, hacia), axis=-1)
+    x = np.sum(desde * hacia, axis=-1)
+    return np.mod(np.arctan2(y, x), 2 * np.pi)
+
+
+def estado_a_elementos(estado, mu: float, tol: float = 1e-10):
+    """
+    Convierte vectores de estado cartesianos en elementos orbitales clásicos.
+
+    Parámetros:
+    ----------
+    estado: numpy.ndarray
+        Array (N, 6) con [x, y, z, vx, vy, vz] por fila (también (6,)).
+    mu: float
+        Parámetro gravitacional.
+    tol: float, opcional
+        Tolerancia para considerar una órbita circular (e < tol) o
+        ecuatorial (|n| / |h| < tol).
+
+    Retorna:
+    --------
+    numpy.ndarray
+        Array (N, 6) con [a, e, i, raan, argp, nu]; los ángulos en grados.
+
+    Nota:
+    -----
+        Los casos particulares se resuelven con np.where, sin ramas por
+        fila:
+        - ecuatorial: raan = 0 y argp se mide desde el eje x.
+        - circular: argp = 0 y nu es el argumento de latitud (o la longitud
+          verdadera si además es ecuatorial).
+    """
+    estado = np.asarray(estado, dtype=float)
+    r_vec = estado[..., :3]
+    v_vec = estado[..., 3:]
+    r = np.linalg.norm(r_vec, axis=-1)
+    v = np.linalg.norm(v_vec, axis=-1)
+
+    # Momento angular, vector nodal y vector excentricidad
+    h_vec = np.cross(r_vec, v_vec)
+    h = np.linalg.norm(h_vec, axis=-1)
+    h_uni = h_vec / h[..., None]
+    n_vec = np.stack([-h_vec[..., 1], h_vec[..., 0],
+                      np.zeros_like(h)], axis=-1)
+    n = np.linalg.norm(n_vec, axis=-1)
+    rv = np.sum(r_vec * v_vec, axis=-1)
+    e_vec = ((v ** 2 - mu / r)[..., None] * r_vec
+             - rv[..., None] * v_vec) / mu
+    e = np.linalg.norm(e_vec, axis=-1)
+
+    a = 1 / (2 / r - v ** 2 / mu)
+    i = np.arccos(np.clip(h_vec[..., 2] / h, -1, 1))
+
+    # Direccion de referencia: linea de nodos o eje x si es ecuatorial
+    ecuatorial = (n / h < tol)[..., None]
+    eje_x = np.array([1.0, 0.0, 0.0])
+    p_uni = np.where(ecuatorial, eje_x,
+                     n_vec / np.where(ecuatorial, 1, n[..., None]))
+
+    # Direccion del periapsis: vector excentricidad o la de referencia
+    circular = (e < tol)[..., None]
+    q_uni = np.where(circular, p_uni,
+                     e_vec / np.where(circular, 1, e[..., None]))
+
+    raan = _angulo(eje_x, p_uni, np.array([0.0, 0.0, 1.0]))
+    argp = _angulo(p_uni, q_uni, h_uni)
+    nu = _angulo(q_uni, r_vec, h_uni)
+
+    return np.stack([a, e, np.degrees(i), np.degrees(raan),
+                     np.degrees(argp), np.degrees(nu)], axis=-1)
+
+
+def elementos_a_estado(elementos, mu: float):
+    """
+    Convierte elementos orbitales clásicos en vectores de estado cartesianos.
+
+    Parámetros:
+    ----------
+    elementos: numpy.ndarray
+        Array (N, 6) con [a, e, i, raan, argp, nu] por fila (también (6,));
+        los ángulos en grados.
+    mu: float
+        Parámetro gravitacional.
+
+    Retorna:
+    --------
+    numpy.ndarray
+        Array (N, 6) con [x, y, z, vx, vy, vz].
+
+    Nota:
+    -----
+        Es la inversa de estado_a_elementos, con las mismas convenciones
+        para órbitas circulares y ecuatoriales.
+    """
+    elementos = np.asarray(elementos, dtype=float)
+    a, e = elementos[..., 0], elementos[..., 1]
+    i, raan, argp, nu = np.radians(np.moveaxis(elementos[..., 2:], -1, 0))
+
+    # Posicion y velocidad en el sistema perifocal
+    p = a * (1 - e ** 2)
+    r = p / (1 + e * np.cos(nu))
+    x_pf, y_pf = r * np.cos(nu), r * np.sin(nu)
+    k = np.sqrt(mu / p)
+    vx_pf, vy_pf = -k * np.sin(nu), k * (e + np.cos(nu))
+
+    # Rotacion perifocal -> inercial: R3(-raan) R1(-i) R3(-argp)
+    cO, sO = np.cos(raan), np.sin(raan)
+    cw, sw = np.cos(argp), np.sin(argp)
+    ci, si = np.cos(i), np.sin(i)
+    P = np.stack([cO * cw - sO * sw * ci, sO * cw + cO * sw * ci, sw * si],
+                 axis=-1)
+    Q = np.stack([-cO * sw - sO * cw * ci, -sO * sw + cO * cw * ci, cw * si],
+                 axis=-1)
+
+    r_vec = x_pf[..., None] * P + y_pf[..., None] * Q
+    v_vec = vx_pf[..., None] * P + vy_pf[..., None] * Q
+    return np.concatenate([r_vec, v_vec], axis=-1)